@@ -0,0 +1,63 @@
+import math
+from typing import Collection, Dict
+
+
+class BloomFilter:
+    """
+    Compact membership prefilter for the vocabulary.
+
+    Answers "definitely not a word" for most of the edits1 strings,
+    so the big word Counter is only probed for likely hits.
+    False positives are possible, false negatives are not.
+    """
+
+    def __init__(self, words: Collection[str], error_rate: float = 0.01):
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1.")
+        n = max(len(words), 1)
+
+        self.error_rate = error_rate
+        # optimal number of bits and hash functions for `n` items
+        self.m = max(8, int(math.ceil(-n * math.log(error_rate) / math.log(2) ** 2)))
+        self.k = max(1, int(round(self.m / n * math.log(2))))
+        self.bits = bytearray((self.m + 7) // 8)
+
+        self.probes = 0
+        self.rejections = 0
+
+        for w in words:
+            self.add(w)
+
+    def _indexes(self, word: str):
+        """Bit positions of `word`, double hashing over the cached str hash."""
+        h = hash(word)
+        h1 = h & 0xFFFFFFFF
+        h2 = ((h >> 32) & 0xFFFFFFFF) | 1
+        m = self.m
+        for i in range(self.k):
+            yield (h1 + i * h2) % m
+
+    def add(self, word: str):
+        for i in self._indexes(word):
+            self.bits[i >> 3] |= 1 << (i & 7)
+
+    def __contains__(self, word: str) -> bool:
+        self.probes += 1
+        bits = self.bits
+        for i in self._indexes(word):
+            if not bits[i >> 3] & (1 << (i & 7)):
+                self.rejections += 1
+                return False
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        """Probe counters and size of the filter."""
+        return {
+            "error_rate": self.error_rate,
+            "bits": self.m,
+            "hashes": self.k,
+            "bytes": len(self.bits),
+            "probes": self.probes,
+            "rejections": self.rejections,
+            "rejection_rate": self.rejections / self.probes if self.probes else 0.0,
+        }
@@ -3,8 +3,11 @@
 from pathlib import Path
 import fileinput
 from argparse import ArgumentParser
+import json
+import sys
 
 from spell import Spell
+from shard import ShardedSpell
 
 
 if __name__ == "__main__":
@@ -35,12 +38,52 @@ if __name__ == "__main__":
         default="./data/spell-errors.txt",
         help="When you want to change the spell-errors file.",
     )
+    parser.add_argument(
+        "-bloom-error-rate",
+        type=float,
+        default=None,
+        help="False-positive rate of the vocabulary prefilter, 0 disables it. "
+             "Off by default, 0.01 with -shards.",
+    )
+    parser.add_argument(
+        "-phonetic",
+        action="store_true",
+        help="Fall back to similar sounding words when nothing is one edit away.",
+    )
+    parser.add_argument(
+        "-shards",
+        type=int,
+        default=0,
+        help="Split the word table over this many worker processes, 0 keeps it in one.",
+    )
+    parser.add_argument(
+        "-stats",
+        action="store_true",
+        help="Print lookup statistics to stderr when done.",
+    )
     args = parser.parse_args()
+    if args.phonetic and args.shards:
+        parser.error("-phonetic is not supported with -shards.")
 
-    speller = Spell(
+    options = dict(
         corpus=args.corpus,
         prob_type=args.prob_type,
-        spell_errors=args.spell_errors)
+        spell_errors=args.spell_errors,
+        phonetic=args.phonetic)
+    if args.bloom_error_rate is not None:
+        options["bloom_error_rate"] = args.bloom_error_rate or None
+    if args.shards:
+        speller = ShardedSpell(shards=args.shards, **options)
+    else:
+        speller = Spell(**options)
+
+    try:
+        for line in fileinput.input(args.files):
+            print(speller.correct(line.rstrip()))
 
-    for line in fileinput.input(args.files):
-        print(speller.correct(line.rstrip()))
+        if args.stats:
+            json.dump(speller.stats(), sys.stderr, indent=2)
+            print(file=sys.stderr)
+    finally:
+        if args.shards:
+            speller.close()
@@ -0,0 +1,122 @@
+import re
+from collections import defaultdict
+from typing import Dict, List, Mapping, Tuple
+
+
+# Letter groups rewritten before the vowels are dropped.
+# Order matters, longer patterns first.
+REWRITES = [
+    (re.compile(r"^(kn|gn|pn|wr)"), lambda m: m.group(0)[1]),
+    (re.compile(r"^x"), lambda m: "s"),
+    (re.compile(r"ph"), lambda m: "f"),
+    (re.compile(r"sch"), lambda m: "sk"),
+    (re.compile(r"ck"), lambda m: "k"),
+    (re.compile(r"c(?=[eiy])"), lambda m: "s"),
+    (re.compile(r"[cq]"), lambda m: "k"),
+    (re.compile(r"x"), lambda m: "ks"),
+    (re.compile(r"z"), lambda m: "s"),
+    (re.compile(r"dg(?=[eiy])"), lambda m: "j"),
+]
+
+NOT_LETTERS = re.compile(r"[^a-z]")
+SILENT = re.compile(r"[aeiouyhw]")
+RUNS = re.compile(r"(.)\1+")
+
+
+def skeleton(word: str) -> str:
+    """
+    Metaphone-style consonant skeleton of `word`.
+
+    Keeps the first letter, rewrites letters that sound alike,
+    drops the vowels and collapses repeated letters.
+    "accheived" and "achieved" both give "akvd".
+    """
+    word = NOT_LETTERS.sub("", word.lower())
+    if not word:
+        return ""
+    for pattern, repl in REWRITES:
+        word = pattern.sub(repl, word)
+    key = word[0] + SILENT.sub("", word[1:])
+    return RUNS.sub(r"\1", key)
+
+
+def dropped(key: str) -> List[str]:
+    """
+    `key` with one letter dropped, the first letter always kept.
+    Keys of two letters are not shortened, one letter is too vague.
+    """
+    if len(key) <= 2:
+        return []
+    variants = list()
+    for i in range(1, len(key)):
+        variant = RUNS.sub(r"\1", key[:i] + key[i + 1:])
+        if variant not in variants:
+            variants.append(variant)
+    return variants
+
+
+class PhoneticIndex:
+    """
+    Skeleton key -> corpus words, exact keys first, then most frequent.
+
+    Every word is also filed under its key with one letter dropped
+    (symmetric delete), so a query missing or adding a consonant
+    meets its word in a shared key. Buckets are ranked and truncated
+    when built, a query costs at most `max_lookups` dict probes.
+    """
+
+    def __init__(self, words: Mapping[str, int], bucket_size: int = 5, max_lookups: int = 8):
+        # key -> (distance, -count, word), trimmed on the way
+        ranked: Dict[str, List[Tuple[int, int, str]]] = defaultdict(list)
+        for w, count in words.items():
+            key = skeleton(w)
+            if not key:
+                continue
+            entries = [(key, 0)] + [(variant, 1) for variant in dropped(key)]
+            for k, distance in entries:
+                bucket = ranked[k]
+                bucket.append((distance, -count, w))
+                if len(bucket) > 2 * bucket_size:
+                    bucket.sort()
+                    del bucket[bucket_size:]
+
+        self.max_lookups = max_lookups
+        self.buckets: Dict[str, List[str]] = {
+            k: [w for _, _, w in sorted(bucket)[:bucket_size]]
+            for k, bucket in ranked.items()
+        }
+
+        self.queries = 0
+        self.lookups = 0
+        self.hits = 0
+
+    def lookup(self, word: str) -> List[str]:
+        """
+        Words sounding like `word`, most frequent first.
+
+        Tries the skeleton itself, which also finds words with one
+        more consonant, then the skeleton with one letter dropped,
+        for a doubled or stray consonant.
+        """
+        self.queries += 1
+        key = skeleton(word)
+        if not key:
+            return []
+
+        for k in ([key] + dropped(key))[:self.max_lookups]:
+            self.lookups += 1
+            bucket = self.buckets.get(k)
+            if bucket:
+                self.hits += 1
+                return bucket
+        return []
+
+    def stats(self) -> Dict[str, float]:
+        """Query counters and size of the index."""
+        return {
+            "keys": len(self.buckets),
+            "queries": self.queries,
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.queries if self.queries else 0.0,
+        }
@@ -0,0 +1,270 @@
+import time
+import zlib
+from collections import Counter
+from multiprocessing import Pipe, Process
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from spell import Spell
+
+
+def shard_of(word: str, shards: int) -> int:
+    """Stable partition of `word`, same in every process."""
+    return zlib.crc32(word.encode("utf-8")) % shards
+
+
+def serve(conn, corpus: Path, shard: int, shards: int, trust: Dict[str, int]):
+    """
+    Worker loop. Counts its own partition of the corpus, reports its
+    size or the error that stopped it, then answers requests until `None`.
+    """
+    try:
+        partition = Counter(w for w in Spell.tokens(corpus) if shard_of(w, shards) == shard)
+    except Exception as e:
+        conn.send(("error", e))
+        conn.close()
+        return
+    # corpus size and distinct words before the spell-errors trust, as in `Spell`
+    total, distinct = sum(partition.values()), len(partition)
+    partition.update(trust)
+    conn.send(("ready", (total, distinct, len(partition))))
+
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+        kind, batch = request
+        if kind == "counts":
+            conn.send([partition.get(w, 0) for w in batch])
+        elif kind == "items":
+            conn.send(list(partition.items()))
+    conn.close()
+
+
+class ShardTable:
+    """
+    Word table split by hash over local worker processes.
+
+    Every worker counts only its own partition of the corpus, the full
+    table never lives in one process. Looks like the word Counter to
+    `Spell`, answers are cached until `clear`.
+    """
+
+    def __init__(self, corpus: Path, shards: int, trust: Mapping[str, int]):
+        if shards < 1:
+            raise ValueError("shards must be at least 1.")
+        trusts: List[Dict[str, int]] = [dict() for _ in range(shards)]
+        for w, extra in trust.items():
+            trusts[shard_of(w, shards)][w] = extra
+
+        self.shards = shards
+        self.conns = list()
+        self.workers = list()
+        for shard in range(shards):
+            parent, child = Pipe()
+            worker = Process(
+                target=serve,
+                args=(child, corpus, shard, shards, trusts[shard]),
+                daemon=True)
+            worker.start()
+            child.close()
+            self.conns.append(parent)
+            self.workers.append(worker)
+
+        # workers count in parallel, collect their sizes
+        try:
+            sizes = list()
+            for i in range(shards):
+                status, answer = self._recv(i)
+                if status == "error":
+                    raise answer
+                sizes.append(answer)
+        except BaseException:
+            self.close()
+            raise
+        self.N = float(sum(total for total, _, _ in sizes))
+        self.distinct = sum(distinct for _, distinct, _ in sizes)
+        self.size = sum(size for _, _, size in sizes)
+
+        self.cache: Dict[str, int] = dict()
+        self.shard_stats = [
+            {"words": size, "requests": 0, "keys": 0, "hits": 0}
+            for _, _, size in sizes
+        ]
+        self.fan_outs: List[float] = list()
+
+    def _send(self, i: int, request):
+        if not self.conns:
+            raise RuntimeError("ShardTable is closed.")
+        try:
+            self.conns[i].send(request)
+        except OSError as e:
+            raise RuntimeError(f"Worker of shard {i} is not running.") from e
+
+    def _recv(self, i: int):
+        if not self.conns:
+            raise RuntimeError("ShardTable is closed.")
+        try:
+            return self.conns[i].recv()
+        except (EOFError, OSError) as e:
+            raise RuntimeError(f"Worker of shard {i} is not running.") from e
+
+    def lookup(self, words: Iterable[str]) -> Dict[str, int]:
+        """Counts of the `words` in the table, misses left out."""
+        words = set(words)
+        batches: Dict[int, List[str]] = dict()
+        for w in words:
+            if w not in self.cache:
+                batches.setdefault(shard_of(w, self.shards), []).append(w)
+
+        if batches:
+            start = time.perf_counter()
+            # send every batch first, so the shards work in parallel
+            for i, batch in batches.items():
+                self._send(i, ("counts", batch))
+            for i, batch in batches.items():
+                counts = self._recv(i)
+                stats = self.shard_stats[i]
+                stats["requests"] += 1
+                stats["keys"] += len(batch)
+                for w, count in zip(batch, counts):
+                    self.cache[w] = count
+                    if count:
+                        stats["hits"] += 1
+            self.fan_outs.append(time.perf_counter() - start)
+
+        return {w: self.cache[w] for w in words if self.cache[w]}
+
+    def clear(self):
+        self.cache.clear()
+
+    def items(self) -> Iterator[Tuple[str, int]]:
+        """Every word and count, one partition in memory at a time."""
+        for i in range(self.shards):
+            self._send(i, ("items", None))
+            yield from self._recv(i)
+
+    def __iter__(self) -> Iterator[str]:
+        return (w for w, _ in self.items())
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.lookup([word])
+
+    def __getitem__(self, word: str) -> int:
+        return self.lookup([word]).get(word, 0)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def close(self):
+        """Stop the workers, closing twice is fine."""
+        for conn in self.conns:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            conn.close()
+        for worker in self.workers:
+            worker.join()
+        self.conns = list()
+        self.workers = list()
+
+    def stats(self) -> Dict[str, object]:
+        """Load per shard and fan-out latencies."""
+        fan_outs = self.fan_outs
+        return {
+            "shards": self.shard_stats,
+            "fan_out": {
+                "count": len(fan_outs),
+                "mean_ms": 1000 * sum(fan_outs) / len(fan_outs) if fan_outs else 0.0,
+                "max_ms": 1000 * max(fan_outs) if fan_outs else 0.0,
+            },
+        }
+
+
+class ShardedSpell(Spell):
+    """
+    `Spell` coordinating a sharded word table.
+
+    The coordinator keeps the corpus size, the spell-errors table and
+    the prefilter, the word counts live in `shards` worker processes.
+    A query looks the word and its candidates up in one parallel batch,
+    the decision stays in the coordinator, so the corrections are the
+    same as with `Spell`. The phonetic fallback needs every word in one
+    index, it is not available here.
+    """
+
+    def __init__(
+            self,
+            corpus: Path,
+            prob_type: str,
+            spell_errors: Path,
+            shards: int = 4,
+            bloom_error_rate: Optional[float] = 0.01,
+            phonetic: bool = False,
+    ):
+        if phonetic:
+            raise ValueError("The phonetic fallback is not supported with shards.")
+
+        self.prepare_spell_error_dict(spell_errors)
+
+        # the workers add the spell-errors corrections to their partitions.
+        self.words = ShardTable(corpus, shards, self.spell_error_trust())
+        self.N = self.words.N
+        self.Nplus = self.N + self.alpha * (self.words.distinct + 1)
+
+        self.prepare_prefilter(bloom_error_rate)
+
+        self.phonetic = None
+
+        self.f = self.P_simple if prob_type.lower() == "simple" else self.P_smooth
+
+    def known(self, words):
+        """The subset of `words` that appear in the dictionary of WORDS."""
+        words = list(words)
+        if self.prefilter is not None:
+            # rejected words are cached as misses, so they are not probed again
+            cache = self.words.cache
+            prefilter = self.prefilter
+            for w in words:
+                if w not in cache and w not in prefilter:
+                    cache[w] = 0
+        return set(self.words.lookup(words))
+
+    def prefetch(self, words: Iterable[str]):
+        """Look `words` and their edits up in one batch, later probes hit the cache."""
+        self.words.clear()
+        self.known([c for word in words for c in (word, *self.edits1(word))])
+
+    def correct(self, word):
+        self.prefetch([word])
+        return super().correct(word)
+
+    def suggest(self, word, k: int = 5):
+        self.prefetch([word])
+        return super().suggest(word, k)
+
+    def suggest_batch(self, words: Iterable[str], k: int = 5):
+        """`suggest` for many words with a single fan-out for the whole batch."""
+        words = list(words)
+        unique = list(dict.fromkeys(words))
+        self.prefetch(unique)
+        cache = dict()
+        for word in unique:
+            # `Spell.suggest` directly, `suggest` here would drop the prefetched batch
+            cache[word] = Spell.suggest(self, word, k)
+        return [list(cache[word]) for word in words]
+
+    def stats(self):
+        stats = super().stats()
+        stats.update(self.words.stats())
+        return stats
+
+    def close(self):
+        self.words.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
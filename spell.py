@@ -1,11 +1,12 @@
 import re
 from collections import Counter, defaultdict
 from pathlib import Path
-from typing import Optional, Tuple, DefaultDict, Set
-import random
+from typing import Optional, Tuple, DefaultDict, Dict, List, Iterable, Iterator
+import heapq
 from sys import stderr
 
-random.seed(17)
+from bloom import BloomFilter
+from phonetic import PhoneticIndex
 
 
 class Spell:
@@ -21,17 +22,35 @@ class Spell:
     # ~8k words!
     SPELL_ERROR_TRUST = 3
 
-    def __init__(self, corpus: Path, prob_type: str, spell_errors: Path):
+    def __init__(
+            self,
+            corpus: Path,
+            prob_type: str,
+            spell_errors: Path,
+            bloom_error_rate: Optional[float] = None,
+            phonetic: bool = False,
+    ):
         self.prepare_corpus(corpus, prob_type)
         
         self.prepare_spell_error_dict(spell_errors)
 
+        self.prepare_prefilter(bloom_error_rate)
+
+        self.phonetic = PhoneticIndex(self.words) if phonetic else None
+
         self.f = self.P_simple if prob_type.lower() == "simple" else self.P_smooth
 
+    @staticmethod
+    def tokens(corpus: Path) -> Iterator[str]:
+        """Every lowercased token of the corpus file, read line by line."""
+        with open(corpus) as f:
+            for line in f:
+                for match in re.finditer(r'\w+', line.lower()):
+                    yield match.group()
+
     def prepare_corpus(self, corpus: Path, prob_type: str):
         """Read the corpus file, count every token."""
-        self.words = Counter(
-            re.findall(r'\w+', open(corpus).read().lower()))
+        self.words = Counter(self.tokens(corpus))
         # corpus size
         self.N = float(sum(self.words.values()))
         # used for size in smoothing
@@ -39,9 +58,7 @@ class Spell:
 
         # for using the spell-errors corrections in the corpus.
         if hasattr(self, "errors"):
-            for v_l in self.errors.values():
-                for v in v_l:
-                    self.words[v] += self.SPELL_ERROR_TRUST
+            self.words.update(self.spell_error_trust())
 
     def prepare_spell_error_dict(self, path: Path):
         """Read the spell-error file,
@@ -59,15 +76,45 @@ class Spell:
                     weight = int(pair[1]) if len(pair) == 2 else 1
                     self.errors[mis][target] += weight
     
-        count = 0
+        self.N_error = float(sum(len(v_l) for v_l in self.errors.values()))
+
+        # for using the spell-errors corrections in the corpus.
+        if hasattr(self, "words"):
+            self.words.update(self.spell_error_trust())
+
+        # ties are broken once here, towards the alphabetically first target.
+        self.best_errors: Dict[str, Tuple[str, float]] = dict()
+        for mis, counter in self.errors.items():
+            target, value = min(counter.items(), key=lambda item: (-item[1], item[0]))
+            self.best_errors[mis] = (target, value / self.N_error * self.ERROR_COEFFICIENT)
+
+    def spell_error_trust(self) -> Counter:
+        """Extra count of every spell-errors correction,
+        `SPELL_ERROR_TRUST` for each misspelling it corrects."""
+        trust = Counter()
         for v_l in self.errors.values():
             for v in v_l:
-                count += 1
-                # for using the spell-errors corrections in the corpus.
-                if hasattr(self, "words"):
-                    self.words[v] += self.SPELL_ERROR_TRUST
+                trust[v] += self.SPELL_ERROR_TRUST
+        return trust
+
+    def prepare_prefilter(self, error_rate: Optional[float]):
+        """Build the Bloom filter over the final vocabulary.
+        `None` disables it, lower error rates use more memory.
+        Off by default, a probe in Python costs more than a dict miss,
+        it pays off only in front of a slower table."""
+        if error_rate is None:
+            self.prefilter = None
+        else:
+            self.prefilter = BloomFilter(self.words, error_rate)
 
-        self.N_error = float(count)
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Runtime counters of the lookup structures."""
+        stats = dict()
+        if self.prefilter is not None:
+            stats["prefilter"] = self.prefilter.stats()
+        if self.phonetic is not None:
+            stats["phonetic"] = self.phonetic.stats()
+        return stats
 
     def P_simple(self, word): 
         """Probability of `word`."""
@@ -78,31 +125,18 @@ class Spell:
         return (self.words[word] + self.alpha) / self.Nplus
 
     def max_from_corpus(self, word) -> Optional[Tuple[str, float]]:
-        """Best suggestion and its probability from corpus."""
-        candids = self.candidates(word)
-        if not candids:
-            return "", 0
-        maxes: Set[str] = set()
-        cur_max_prob = 0
-        for c in candids:
+        """Best suggestion and its probability from corpus.
+        Ties go to the alphabetically first word."""
+        best_word, max_prob = "", 0
+        for c in self.candidates(word):
             cur_prob = self.f(c)
-            if cur_prob > cur_max_prob:
-                maxes = set([c])
-                cur_max_prob = cur_prob
-        return random.choice(list(maxes)), cur_max_prob
+            if cur_prob > max_prob or (cur_prob == max_prob and c < best_word):
+                best_word, max_prob = c, cur_prob
+        return best_word, max_prob
 
     def max_from_spell_errors(self, word) -> Optional[Tuple[str, float]]:
         """Best suggestion and its probability from spell-errors."""
-        spelling_error_counter = self.errors[word]
-        spelling_common = spelling_error_counter.most_common(1)
-        if spelling_common:
-            maxes = [(key, value) for key, value in spelling_error_counter.items() if value == spelling_common[0][1]]
-            key, value = random.choice(maxes)
-            value /= self.N_error
-            value = value * self.ERROR_COEFFICIENT
-        else:
-            key, value = "", 0
-        return key, value
+        return self.best_errors.get(word, ("", 0))
 
     def correct(self, word): 
         """Most probable spelling correction for word."""
@@ -116,16 +150,72 @@ class Spell:
 
         if prob > value:
             return best_word
-        else:
+        elif key or self.phonetic is None:
             return key
 
+        # nothing one edit away, fall back to words sounding alike.
+        sounds_like = self.phonetic.lookup(word)
+        return sounds_like[0] if sounds_like else ""
+
+    def suggest(self, word, k: int = 5) -> List[Tuple[str, float, str]]:
+        """
+        Up to `k` best corrections for `word` as (word, score, source).
+
+        Scores are on the scale `correct` compares, source is one of
+        "known", "corpus", "spell_errors" or "phonetic". A known word
+        comes first, just like `correct` returns it. Phonetic fallbacks
+        keep the order of the index, as `correct` takes the first one.
+        """
+        if k <= 0:
+            return []
+
+        scored: Dict[str, Tuple[float, str]] = dict()
+        for c in self.known(self.edits1(word)):
+            scored[c] = (self.f(c), "corpus")
+
+        spelling_error_counter = self.errors.get(word, {})
+        for target, count in spelling_error_counter.items():
+            value = count / self.N_error * self.ERROR_COEFFICIENT
+            # ties go to spell-errors, as in `correct`
+            if target not in scored or value >= scored[target][0]:
+                scored[target] = (value, "spell_errors")
+
+        sounds_like: List[str] = list()
+        if not scored and self.phonetic is not None:
+            sounds_like = [c for c in self.phonetic.lookup(word) if c != word]
+
+        suggestions = list()
+        if word in self.words:
+            scored.pop(word, None)
+            suggestions.append((word, self.f(word), "known"))
+            k -= 1
+
+        # same order as `correct`: score, spell-errors on ties, then alphabetical
+        best = heapq.nsmallest(
+            k,
+            scored.items(),
+            key=lambda item: (-item[1][0], item[1][1] != "spell_errors", item[0]))
+        suggestions.extend((c, score, source) for c, (score, source) in best)
+        suggestions.extend((c, self.f(c), "phonetic") for c in sounds_like[:k])
+        return suggestions
+
+    def suggest_batch(self, words: Iterable[str], k: int = 5) -> List[List[Tuple[str, float, str]]]:
+        """`suggest` for many words, repeated words are looked up once
+        and get their own copy of the list."""
+        words = list(words)
+        cache = {word: self.suggest(word, k) for word in dict.fromkeys(words)}
+        return [list(cache[word]) for word in words]
+
     def candidates(self, word):
         """Generate possible spelling corrections for word."""
         return self.known([word]) or self.known(self.edits1(word))
 
     def known(self, words):
         """The subset of `words` that appear in the dictionary of WORDS."""
-        return set(w for w in words if w in self.words)
+        if self.prefilter is None:
+            return set(w for w in words if w in self.words)
+        prefilter = self.prefilter
+        return set(w for w in words if w in prefilter and w in self.words)
 
     @staticmethod
     def edits1(word: str):
@@ -0,0 +1,285 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from bloom import BloomFilter
+from phonetic import PhoneticIndex, skeleton
+from shard import ShardedSpell, shard_of
+from spell import Spell
+
+
+CORPUS = """
+The quick brown fox jumps over the lazy dog.
+The dog sleeps, the fox runs. A spelling test for the speller.
+Bun and hun.
+"""
+
+SPELL_ERRORS = """spelling: speling, spelin*2
+four: fore*5, for*4
+cot: kat
+cat: kat
+"""
+
+
+class SpellTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        tmp = Path(self.tmp.name)
+        self.corpus = tmp / "corpus.txt"
+        self.spell_errors = tmp / "spell-errors.txt"
+        self.corpus.write_text(CORPUS)
+        self.spell_errors.write_text(SPELL_ERRORS)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def speller(self, prob_type="simple", **kwargs):
+        return Spell(
+            corpus=self.corpus,
+            prob_type=prob_type,
+            spell_errors=self.spell_errors,
+            **kwargs)
+
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_no_false_negatives(self):
+        words = [f"word{i}" for i in range(1000)]
+        bloom = BloomFilter(words, 0.01)
+        for w in words:
+            self.assertIn(w, bloom)
+
+    def test_rejects_most(self):
+        bloom = BloomFilter([f"word{i}" for i in range(1000)], 0.01)
+        misses = sum(f"miss{i}" in bloom for i in range(10000))
+        self.assertLess(misses, 500)
+        stats = bloom.stats()
+        self.assertEqual(stats["probes"], 10000)
+        self.assertGreater(stats["rejection_rate"], 0.95)
+
+    def test_bad_rate(self):
+        with self.assertRaises(ValueError):
+            BloomFilter(["a"], 1.5)
+
+
+class TestPrefilter(SpellTestCase):
+
+    def test_same_corrections(self):
+        plain = self.speller()
+        filtered = self.speller(bloom_error_rate=0.01)
+        for word in ["teh", "quik", "dgo", "speling", "fore", "xyzzy", "fox"]:
+            self.assertEqual(plain.correct(word), filtered.correct(word))
+
+    def test_stats(self):
+        speller = self.speller(bloom_error_rate=0.01)
+        speller.correct("quik")
+        stats = speller.stats()["prefilter"]
+        self.assertGreater(stats["probes"], 0)
+        self.assertGreater(stats["rejections"], 0)
+
+    def test_disabled(self):
+        speller = self.speller()
+        self.assertEqual(speller.correct("quik"), "quick")
+        self.assertNotIn("prefilter", speller.stats())
+
+
+class TestSuggest(SpellTestCase):
+
+    def test_first_is_correct(self):
+        speller = self.speller()
+        for word in ["quik", "dgo", "speling", "fore", "fox"]:
+            suggestions = speller.suggest(word, 3)
+            self.assertEqual(suggestions[0][0], speller.correct(word))
+
+    def test_sources_and_order(self):
+        speller = self.speller()
+        suggestions = speller.suggest("fore", 5)
+        words = [w for w, _, _ in suggestions]
+        self.assertEqual(words[0], "four")
+        self.assertEqual(suggestions[0][2], "spell_errors")
+        self.assertIn("for", words)
+        scores = [s for _, s, _ in suggestions]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_known(self):
+        suggestions = self.speller().suggest("fox", 2)
+        self.assertEqual(suggestions[0], ("fox", suggestions[0][1], "known"))
+        self.assertLessEqual(len(suggestions), 2)
+
+    def test_bounded(self):
+        speller = self.speller()
+        self.assertEqual(speller.suggest("quik", 0), [])
+        self.assertEqual(len(speller.suggest("fore", 1)), 1)
+        self.assertEqual(speller.suggest("xyzzy", 3), [])
+
+    def test_batch(self):
+        speller = self.speller()
+        words = ["quik", "fore", "quik"]
+        results = speller.suggest_batch(words, 3)
+        self.assertEqual(results, [speller.suggest(w, 3) for w in words])
+        results[0].clear()
+        self.assertNotEqual(results[2], [])
+
+
+class TestPhonetic(SpellTestCase):
+
+    def test_skeleton(self):
+        self.assertEqual(skeleton("accheived"), skeleton("achieved"))
+        self.assertEqual(skeleton("accomodate"), skeleton("accommodate"))
+        self.assertEqual(skeleton("fone"), skeleton("phone"))
+        self.assertEqual(skeleton("123"), "")
+
+    def test_fallback(self):
+        self.assertEqual(self.speller().correct("spelenng"), "")
+        speller = self.speller(phonetic=True)
+        self.assertEqual(speller.correct("spelenng"), "spelling")
+        self.assertEqual(speller.correct("quik"), "quick")
+        self.assertEqual(speller.stats()["phonetic"]["hits"], 1)
+
+    def test_suggest(self):
+        suggestions = self.speller(phonetic=True).suggest("spelenng", 3)
+        self.assertEqual(suggestions[0][0], "spelling")
+        self.assertEqual(suggestions[0][2], "phonetic")
+
+    def test_suggest_keeps_index_order(self):
+        # "spelling" shares the exact key, "spellings" only a dropped-letter one
+        self.corpus.write_text("spelling " + "spellings " * 10)
+        self.spell_errors.write_text("four: fore\n")
+        speller = self.speller(phonetic=True)
+        suggestions = speller.suggest("spelenng", 3)
+        self.assertEqual(speller.correct("spelenng"), "spelling")
+        self.assertEqual([w for w, _, _ in suggestions], ["spelling", "spellings"])
+        self.assertLess(suggestions[0][1], suggestions[1][1])
+
+    def test_index(self):
+        index = PhoneticIndex({"achieved": 2, "ambiguity": 3, "about": 50, "a_bit": 9})
+        self.assertEqual(index.lookup("accheived")[0], "achieved")
+        self.assertEqual(index.lookup("amibuity")[0], "ambiguity")
+
+    def test_first_letter_kept(self):
+        index = PhoneticIndex({"individual": 2, "needle": 20})
+        self.assertEqual(index.lookup("indidual"), ["individual"])
+        self.assertEqual(index.lookup("xndl"), [])
+
+    def test_bounded_lookups(self):
+        index = PhoneticIndex({"brown": 1}, max_lookups=3)
+        self.assertEqual(index.lookup("xyzzyqqq"), [])
+        self.assertLessEqual(index.stats()["lookups"], 3)
+
+
+class TestShards(SpellTestCase):
+
+    def test_same_corrections(self):
+        speller = self.speller()
+        words = ["teh", "quik", "dgo", "speling", "fore", "xyzzy", "fox", "spelenng"]
+        with ShardedSpell(
+                corpus=self.corpus,
+                prob_type="simple",
+                spell_errors=self.spell_errors,
+                shards=3) as sharded:
+            for word in words:
+                self.assertEqual(speller.correct(word), sharded.correct(word))
+                self.assertEqual(speller.suggest(word, 3), sharded.suggest(word, 3))
+
+            self.assertEqual((speller.N, speller.Nplus), (sharded.N, sharded.Nplus))
+            stats = sharded.stats()
+            self.assertEqual(len(stats["shards"]), 3)
+            self.assertEqual(sum(s["words"] for s in stats["shards"]), len(speller.words))
+            self.assertGreater(stats["fan_out"]["count"], 0)
+
+    def sharded(self, **kwargs):
+        return ShardedSpell(
+            corpus=self.corpus,
+            prob_type="simple",
+            spell_errors=self.spell_errors,
+            **kwargs)
+
+    def test_one_fan_out_per_query(self):
+        words = ["teh", "quik", "fox", "xyzzy"]
+        for rate in [0.01, None]:
+            with self.sharded(shards=3, bloom_error_rate=rate) as sharded:
+                for word in words:
+                    sharded.correct(word)
+                self.assertEqual(sharded.stats()["fan_out"]["count"], len(words))
+
+    def test_no_phonetic(self):
+        with self.assertRaises(ValueError):
+            self.sharded(shards=2, phonetic=True)
+        self.assertEqual(multiprocessing.active_children(), [])
+
+    def test_startup_error(self):
+        with self.assertRaises(FileNotFoundError):
+            ShardedSpell(
+                corpus=Path(self.tmp.name) / "missing.txt",
+                prob_type="simple",
+                spell_errors=self.spell_errors,
+                shards=2)
+        self.assertEqual(multiprocessing.active_children(), [])
+
+    def test_batch_one_fan_out(self):
+        speller = self.speller()
+        words = ["teh", "quik", "fore", "quik", "fox", "xyzzy"]
+        with self.sharded(shards=3) as sharded:
+            results = sharded.suggest_batch(words, 3)
+            self.assertEqual(sharded.stats()["fan_out"]["count"], 1)
+            self.assertEqual(results, speller.suggest_batch(words, 3))
+            results[1].clear()
+            self.assertNotEqual(results[3], [])
+
+    def test_closed(self):
+        sharded = self.sharded(shards=2)
+        sharded.close()
+        sharded.close()
+        with self.assertRaises(RuntimeError):
+            sharded.correct("quik")
+
+    def test_dead_worker(self):
+        with self.sharded(shards=2, bloom_error_rate=None) as sharded:
+            for worker in sharded.words.workers:
+                worker.terminate()
+                worker.join()
+            with self.assertRaises(RuntimeError):
+                sharded.correct("quik")
+
+    def test_shard_of(self):
+        self.assertEqual(shard_of("spelling", 7), shard_of("spelling", 7))
+        self.assertTrue(0 <= shard_of("spelling", 7) < 7)
+
+
+class TestTies(SpellTestCase):
+
+    def test_corpus_tie(self):
+        speller = self.speller()
+        self.assertEqual(speller.max_from_corpus("xun")[0], "bun")
+        self.assertEqual(speller.correct("xun"), "bun")
+        self.assertEqual([w for w, _, _ in speller.suggest("xun", 2)], ["bun", "hun"])
+
+    def test_spell_errors_tie(self):
+        speller = self.speller()
+        self.assertEqual(speller.max_from_spell_errors("kat")[0], "cat")
+        self.assertEqual(speller.correct("kat"), "cat")
+        self.assertEqual(speller.max_from_spell_errors("xyzzy"), ("", 0))
+        self.assertNotIn("xyzzy", speller.errors)
+
+    def test_across_processes(self):
+        code = (
+            "import sys; from spell import Spell; "
+            "s = Spell(sys.argv[1], 'simple', sys.argv[2]); "
+            "print([s.correct(w) for w in ['xat', 'kat', 'quik', 'fo', 'og']])"
+        )
+        outputs = set()
+        for seed in ["1", "2", "3"]:
+            outputs.add(subprocess.run(
+                [sys.executable, "-c", code, str(self.corpus), str(self.spell_errors)],
+                capture_output=True,
+                check=True,
+                encoding="utf-8",
+                cwd=Path(__file__).parent,
+                env=dict(os.environ, PYTHONHASHSEED=seed),
+            ).stdout)
+        self.assertEqual(len(outputs), 1)